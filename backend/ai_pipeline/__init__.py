@@ -1,3 +1,3 @@
-from .embeddings import chunk_article, embed_chunks
+from .embeddings import chunk_article, embed_chunks, LocalEmbeddingModel
 from .retrieval import retrieve_relevant_chunks
 from .generation import generate_campaign_kit
\ No newline at end of file
@@ -1,3 +1,5 @@
+import functools
+
 GCP_PROJECT = "proj-benevity-c"
 GCP_LOCATION = "us-central1"
 
@@ -37,4 +39,16 @@ CAMPAIGN_KIT_SCHEMA = {
         },
     },
     "required": ["title", "location", "event_type", "summary", "key_claims", "confidence_score"],
-}
\ No newline at end of file
+}
+
+
+@functools.cache
+def init_vertexai():
+    """Initialise the Vertex SDK once, on first use of a default model.
+
+    Imported lazily so callers that inject their own models (tests, local
+    runs) and the rest of the backend don't need the SDK installed.
+    """
+    import vertexai
+
+    vertexai.init(project=GCP_PROJECT, location=GCP_LOCATION)
@@ -1,15 +1,38 @@
-import vertexai
-from vertexai.language_models import TextEmbeddingModel
-from config import GCP_PROJECT, GCP_LOCATION, EMBEDDING_MODEL
-vertexai.init(project=GCP_PROJECT, location=GCP_LOCATION)
+import hashlib
+import math
+import re
+from dataclasses import dataclass
 
-def chunk_article(article_text: str, source_url: str, title: str, publish_date: str, campaign_id: str):
-    """Split article into chunks with metadata."""
+from .config import EMBEDDING_MODEL, init_vertexai
+
+
+def default_embedding_model():
+    """The configured Vertex embedding model (imports the SDK on first use)."""
+    init_vertexai()
+    from vertexai.language_models import TextEmbeddingModel
+
+    return TextEmbeddingModel.from_pretrained(EMBEDDING_MODEL)
+
+
+def chunk_article(
+    article_text: str,
+    source_url: str,
+    title: str,
+    publish_date: str,
+    campaign_id: str,
+    article_index: int | None = None,
+):
+    """Split article into chunks with metadata.
+
+    Pass `article_index` when chunking several articles for one campaign so
+    chunk ids stay unique.
+    """
+    id_prefix = campaign_id if article_index is None else f"{campaign_id}_a{article_index}"
     paragraphs = [p.strip() for p in article_text.strip().split("\n\n") if p.strip()]
     chunks = []
     for i, para in enumerate(paragraphs):
         chunks.append({
-            "id": f"{campaign_id}_chunk_{i}",
+            "id": f"{id_prefix}_chunk_{i}",
             "text": para,
             "source_url": source_url,
             "title": title,
@@ -18,10 +41,41 @@ def chunk_article(article_text: str, source_url: str, title: str, publish_date:
         })
     return chunks
 
-def embed_chunks(chunks: list):
-    """Generate embeddings for each chunk."""
-    model = TextEmbeddingModel.from_pretrained(EMBEDDING_MODEL)
+def embed_chunks(chunks: list, model=None):
+    """Generate embeddings for each chunk.
+
+    `model` is anything with Vertex's `get_embeddings(texts)` interface;
+    defaults to the configured Vertex embedding model.
+    """
+    model = model or default_embedding_model()
     for chunk in chunks:
         embedding = model.get_embeddings([chunk["text"]])[0].values
         chunk["embedding"] = embedding
-    return chunks
\ No newline at end of file
+    return chunks
+
+
+@dataclass
+class LocalEmbedding:
+    values: list[float]
+
+
+class LocalEmbeddingModel:
+    """Offline stand-in for TextEmbeddingModel (hashed bag of words).
+
+    Same `get_embeddings` interface, no network calls. Meant for tests and
+    local runs, not for retrieval quality.
+    """
+
+    def __init__(self, dimensions: int = 256):
+        self.dimensions = dimensions
+
+    def get_embeddings(self, texts: list[str]) -> list[LocalEmbedding]:
+        out = []
+        for text in texts:
+            vec = [0.0] * self.dimensions
+            for token in re.findall(r"\w+", text.lower()):
+                digest = hashlib.md5(token.encode("utf-8")).digest()
+                vec[int.from_bytes(digest[:4], "little") % self.dimensions] += 1.0
+            norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+            out.append(LocalEmbedding(values=[v / norm for v in vec]))
+        return out
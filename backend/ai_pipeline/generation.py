@@ -1,16 +1,32 @@
+import functools
 import json
-import vertexai
-from vertexai.generative_models import GenerativeModel, GenerationConfig
-from config import GCP_PROJECT, GCP_LOCATION, GENERATION_MODEL, CAMPAIGN_KIT_SCHEMA
+from .config import GENERATION_MODEL, CAMPAIGN_KIT_SCHEMA, init_vertexai
 
-vertexai.init(project=GCP_PROJECT, location=GCP_LOCATION)
 
-_GENERATION_CONFIG = GenerationConfig(
-    response_mime_type="application/json",
-    response_schema=CAMPAIGN_KIT_SCHEMA,
-    temperature=0.2,
-    max_output_tokens=2048,
-)
+@functools.cache
+def default_generation_config():
+    """Structured-output config for Gemini (imports the SDK on first use).
+
+    Must be a real GenerationConfig: the SDK only converts CAMPAIGN_KIT_SCHEMA
+    into Vertex's schema format there, not when handed a plain dict.
+    """
+    init_vertexai()
+    from vertexai.generative_models import GenerationConfig
+
+    return GenerationConfig(
+        response_mime_type="application/json",
+        response_schema=CAMPAIGN_KIT_SCHEMA,
+        temperature=0.2,
+        max_output_tokens=2048,
+    )
+
+
+def default_generation_model():
+    """The configured Gemini model (imports the SDK on first use)."""
+    init_vertexai()
+    from vertexai.generative_models import GenerativeModel
+
+    return GenerativeModel(GENERATION_MODEL)
 
 
 def _build_prompt(context: str, sources: str) -> str:
@@ -46,16 +62,21 @@ def _validate_urls(kit: dict, allowed_urls: list) -> tuple[bool, list]:
     return (len(bad) == 0), bad
 
 
-def generate_campaign_kit(retrieved_chunks: list, source_urls: list) -> dict:
-    """Generate a campaign kit from retrieved chunks using Gemini structured output."""
-    model = GenerativeModel(GENERATION_MODEL)
+def generate_campaign_kit(retrieved_chunks: list, source_urls: list, model=None, generation_config=None) -> dict:
+    """Generate a campaign kit from retrieved chunks using Gemini structured output.
+
+    `model` is anything with GenerativeModel's `generate_content` interface;
+    stand-in models should bring their own `generation_config`.
+    """
+    model = model or default_generation_model()
+    generation_config = generation_config or default_generation_config()
 
     context = "\n\n---\n\n".join([chunk["text"] for chunk, _ in retrieved_chunks])
     sources = "\n".join(source_urls)
     prompt = _build_prompt(context, sources)
 
     # First attempt
-    response = model.generate_content(prompt, generation_config=_GENERATION_CONFIG)
+    response = model.generate_content(prompt, generation_config=generation_config)
     kit = json.loads(response.text)
 
     valid, bad_urls = _validate_urls(kit, source_urls)
@@ -70,7 +91,7 @@ def generate_campaign_kit(retrieved_chunks: list, source_urls: list) -> dict:
         f"Regenerate the campaign kit using only those exact URLs."
     )
     retry_response = model.generate_content(
-        correction_prompt, generation_config=_GENERATION_CONFIG
+        correction_prompt, generation_config=generation_config
     )
     retry_kit = json.loads(retry_response.text)
 
@@ -1,21 +1,18 @@
 import numpy as np
-import vertexai
-from vertexai.language_models import TextEmbeddingModel
-from config import GCP_PROJECT, GCP_LOCATION, EMBEDDING_MODEL
-
-vertexai.init(project=GCP_PROJECT, location=GCP_LOCATION)
+from .embeddings import default_embedding_model
 
 def cosine_similarity(a, b):
     a, b = np.array(a), np.array(b)
     return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
 
-def retrieve_relevant_chunks(query: str, all_chunks: list, top_k: int = 5):
+def retrieve_relevant_chunks(query: str, all_chunks: list, top_k: int = 5, model=None):
     """Find the most relevant chunks for a query using cosine similarity.
     
     In production with deployed Vector Search endpoint, replace this
-    with endpoint.find_neighbors() call.
+    with endpoint.find_neighbors() call. `model` must be the same embedding
+    model the chunks were embedded with.
     """
-    model = TextEmbeddingModel.from_pretrained(EMBEDDING_MODEL)
+    model = model or default_embedding_model()
     query_embedding = model.get_embeddings([query])[0].values
     
     scored = []
@@ -1,7 +1,8 @@
-from embeddings import chunk_article, embed_chunks
-from retrieval import retrieve_relevant_chunks
-from generation import generate_campaign_kit
-from config import GCP_PROJECT, GCP_LOCATION, EMBEDDING_MODEL
+# Run from backend/: python -m ai_pipeline.test_pipeline
+from ai_pipeline.embeddings import chunk_article, embed_chunks
+from ai_pipeline.retrieval import retrieve_relevant_chunks
+from ai_pipeline.generation import generate_campaign_kit
+from ai_pipeline.config import GCP_PROJECT, GCP_LOCATION, EMBEDDING_MODEL
 
 
 # Test article (WHO flooding article)
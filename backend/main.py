@@ -1,16 +1,22 @@
 import json
 import logging
-from datetime import timedelta
-from email.utils import parsedate_to_datetime
+from datetime import datetime
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import StreamingResponse
 
+try:
+    import orjson
+except ImportError:  # fall back to stdlib json if orjson isn't installed
+    orjson = None
+
+from pipeline.campaign import CampaignPipeline
+from pipeline.event_index import ALERT_LEVELS
 from pipeline.gdacs_client import GDACSClient
 from pipeline.orchestrator import ScraperPipeline
-from pipeline.news_searcher import EVENT_TYPE_LABELS
-from models import DisasterEvent
+from models import Article, ArticleCard, ScrapeRequest
 
 
 app = FastAPI()
@@ -23,9 +29,12 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# text/event-stream is excluded by default, so SSE still flushes per event
+app.add_middleware(GZipMiddleware, minimum_size=1000)
 
 gdacs_client = GDACSClient()
 pipeline = ScraperPipeline()
+campaign_pipeline = CampaignPipeline(pipeline)
 
 
 @app.get("/api/health")
@@ -34,115 +43,133 @@ def health_check():
 
 
 @app.get("/api/events")
-def get_events():
-    events = gdacs_client.fetch_events()
-    return {"events": events}
-
-
-def _sse(data: dict) -> str:
-    return f"data: {json.dumps(data)}\n\n"
+def get_events(
+    event_type: str | None = None,
+    min_alert: str | None = None,
+    since: str | None = None,
+    min_lat: float | None = Query(default=None, ge=-90, le=90),
+    min_lon: float | None = Query(default=None, ge=-180, le=180),
+    max_lat: float | None = Query(default=None, ge=-90, le=90),
+    max_lon: float | None = Query(default=None, ge=-180, le=180),
+    lat: float | None = Query(default=None, ge=-90, le=90),
+    lon: float | None = Query(default=None, ge=-180, le=180),
+    radius_km: float | None = Query(default=None, gt=0),
+    limit: int | None = Query(default=None, ge=1, le=500),
+    cursor: str | None = None,
+):
+    if min_alert and min_alert.lower() not in ALERT_LEVELS:
+        raise HTTPException(status_code=400, detail="min_alert must be Green, Orange or Red")
+
+    since_dt = None
+    if since:
+        try:
+            since_dt = datetime.fromisoformat(since)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="since must be an ISO 8601 date")
+
+    bbox_parts = (min_lat, min_lon, max_lat, max_lon)
+    bbox = None
+    if any(p is not None for p in bbox_parts):
+        if any(p is None for p in bbox_parts):
+            raise HTTPException(status_code=400, detail="bbox needs min_lat, min_lon, max_lat and max_lon")
+        bbox = bbox_parts
+
+    near_parts = (lat, lon, radius_km)
+    near = None
+    if any(p is not None for p in near_parts):
+        if any(p is None for p in near_parts):
+            raise HTTPException(status_code=400, detail="radius search needs lat, lon and radius_km")
+        near = near_parts
+
+    index = gdacs_client.get_index()
+    offset = 0
+    if cursor:
+        # cursors are "<snapshot_id>:<offset>" so paging across a feed refresh is detected
+        snapshot_id, _, raw_offset = cursor.partition(":")
+        try:
+            offset = int(raw_offset)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        if offset < 0:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        if snapshot_id != index.snapshot_id:
+            raise HTTPException(status_code=400, detail="Cursor expired, the event feed was refreshed")
+
+    events, total = index.query(
+        event_type=event_type,
+        min_alert=min_alert,
+        since=since_dt,
+        bbox=bbox,
+        near=near,
+        limit=limit,
+        offset=offset,
+    )
+    next_offset = offset + len(events)
+    next_cursor = None
+    if limit is not None and next_offset < total:
+        next_cursor = f"{index.snapshot_id}:{next_offset}"
+    return {"events": events, "total": total, "next_cursor": next_cursor}
+
+
+SNIPPET_CHARS = 280
+
+
+@app.get("/api/articles/{article_id}")
+def get_article(article_id: str) -> Article:
+    article = pipeline.article_store.get(article_id)
+    if article is None:
+        raise HTTPException(status_code=404, detail="Article not found")
+    return article
+
+
+def _sse(data: dict) -> bytes:
+    if orjson is not None:
+        return b"data: " + orjson.dumps(data) + b"\n\n"
+    return f"data: {json.dumps(data)}\n\n".encode("utf-8")
+
+
+def _snippet(text: str, limit: int = SNIPPET_CHARS) -> str:
+    text = " ".join(text.split())
+    if len(text) <= limit:
+        return text
+    cut = text[:limit].rsplit(" ", 1)[0]
+    return cut + "..."
+
+
+def _article_card(article: Article, article_id: str) -> ArticleCard:
+    return ArticleCard(
+        id=article_id,
+        url=article.url,
+        title=article.title,
+        source=article.source,
+        publish_date=article.publish_date,
+        snippet=_snippet(article.text),
+        image_url=article.image_urls[0] if article.image_urls else None,
+    )
 
 
 @app.post("/api/scrape/stream")
-def scrape_stream(request: DisasterEvent):
+def scrape_stream(request: ScrapeRequest):
     def generate():
-        if not request:
-            yield _sse({"type": "error", "message": "Query is required"})
-            return
-        
-        event_type = request.event_type
-        country = request.country
-        event_name = request.event_name
-        date = request.date
-        type_str = EVENT_TYPE_LABELS.get(event_type.upper(), event_type)
-        max_articles = request.max_articles or 5
-        query = [type_str]
-        if event_name:
-            query.append(event_name)
-        elif country:
-            query.append(country)
-        else:
-            yield _sse({"type": "error", "message": "Failed to retrieve event"})
-            return
-        
-        relevance_keywords = query.copy() # keywords for relevance filtering
-        if date:
-            try:
-                dt = parsedate_to_datetime(date)
-                after = dt.strftime("%Y-%m-%d")
-                before = (dt + timedelta(days=5)).strftime("%Y-%m-%d")
-                query.append("after:" + after)
-                query.append("before:" + before)
-            except Exception:
-                logger.warning("Could not parse event date for query window: %s", date)
-                yield _sse({"type": "error", "message": "Failed parse event date"})
-                return
-
-        query = '+'.join(query) # join query to a single string with + delim
-
-        yield _sse({"type": "status", "message": 'Searching for "' + query + '"'})
-
-        # oversample so we still end up with max_articles even if some fail/are irrelevant
-        search_limit = max_articles * 4  # tweak 3–6 depending on speed/quality tradeoff
+        for event in pipeline.stream_articles(request):
+            if event["type"] == "article":
+                article = event["article"]
+                if request.slim:
+                    article_id = pipeline.article_store.put(article)
+                    card = _article_card(article, article_id)
+                    yield _sse({"type": "article", "article": card.model_dump()})
+                else:
+                    yield _sse({"type": "article", "article": article.model_dump()})
+            else:
+                yield _sse(event)
 
-        try:
-            results = pipeline.news_searcher.search(query, search_limit)
-        except Exception:
-            logger.exception("Search failed for query=%s", query)
-            yield _sse({"type": "error", "message": "Failed to search news"})
-            return
-
-        total = len(results)
-        if total == 0:
-            yield _sse({"type": "error", "message": "Did not find relevant articles"})
-            return
-
-        yield _sse({
-            "type": "status",
-            "message": f"Found {total} results. Scraping up to {max_articles} articles..."
-        })
-
-        sent = 0
-
-        for i, result in enumerate(results):
-            if sent >= max_articles:
-                break
-
-            n = str(i + 1)
-            yield _sse({
-                "type": "progress",
-                "message": "[" + n + "/" + str(total) + "] Resolving " + str(result.source) + "...",
-                "current": i + 1,
-                "total": total,
-            })
-
-            real_url = pipeline.news_searcher.resolve_url(result.url)
-            article = pipeline.article_scraper.scrape(real_url)
-
-            if not article:
-                yield _sse({
-                    "type": "progress",
-                    "message": "[" + n + "/" + str(total) + "] Skipped (could not parse)",
-                    "current": i + 1,
-                    "total": total,
-                })
-                continue
-
-            # Relevance filter
-            if relevance_keywords:
-                haystack = (article.title + " " + article.text).lower()
-                if not any((kw or "").lower() in haystack for kw in relevance_keywords):
-                    yield _sse({
-                        "type": "progress",
-                        "message": "[" + n + "/" + str(total) + "] Skipped (not relevant)",
-                        "current": i + 1,
-                        "total": total,
-                    })
-                    continue
-
-            sent += 1
-            yield _sse({"type": "article", "article": article.model_dump()})
-
-        yield _sse({"type": "done", "sent": sent, "requested": max_articles})
+    return StreamingResponse(generate(), media_type="text/event-stream")
+
+
+@app.post("/api/campaign/stream")
+def campaign_stream(request: ScrapeRequest):
+    def generate():
+        for event in campaign_pipeline.stream(request):
+            yield _sse(event)
 
     return StreamingResponse(generate(), media_type="text/event-stream")
@@ -12,7 +12,16 @@ class DisasterEvent(BaseModel):
     lon: float
     date: str
     gdacs_url: str
+
+
+class ScrapeRequest(DisasterEvent):
+    """Body of the scrape/campaign stream endpoints: an event plus scrape options."""
     max_articles: int = Field(default=5, ge=1, le=50)
+    slim: bool = False
+    validate_images: bool = False
+    # overall SLA for a scrape stream; no new candidates start once it's spent
+    latency_budget_s: float | None = Field(default=None, gt=0, le=300)
+    article_timeout_s: float = Field(default=20, gt=0, le=120)
 
 
 class NewsResult(BaseModel):
@@ -31,3 +40,13 @@ class Article(BaseModel):
     source: str
     summary: str
     image_urls: list[str] = []
+
+
+class ArticleCard(BaseModel):
+    id: str
+    url: str
+    title: str
+    source: str
+    publish_date: str | None
+    snippet: str
+    image_url: str | None = None
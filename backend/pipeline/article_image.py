@@ -1,11 +1,20 @@
 # backend/pipeline/article_image.py
 from __future__ import annotations
 
+import hashlib
+import logging
 import re
+import struct
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urljoin, urlparse, urlunparse
 
+import requests
 from bs4 import BeautifulSoup
 
+logger = logging.getLogger(__name__)
+
 _IMAGE_EXT_RE = re.compile(r"\.(jpg|jpeg|png|webp|gif|bmp|tiff|avif)(\?|$)", re.I)
 
 # crude-but-effective MVP filters
@@ -185,4 +194,160 @@ def extract_article_image_urls(html: str, page_url: str, max_images: int = 10) -
         if len(out) >= max_images:
             break
 
-    return out[:max_images]
\ No newline at end of file
+    return out[:max_images]
+
+
+# --- optional validation: probe the first few KB of each candidate ---
+
+_PROBE_BYTES = 16 * 1024
+_PROBE_HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; benevity-scraper/1.0)"}
+_PROBE_CACHE_SIZE = 2048
+_PERMANENT_FAILURE_STATUSES = (404, 410)
+
+# url -> (format, width, height, digest of probed bytes) or None if broken
+_probe_cache: OrderedDict[str, tuple[str, int, int, str] | None] = OrderedDict()
+_probe_lock = threading.Lock()
+
+
+def _sniff_image_size(data: bytes) -> tuple[str, int, int] | None:
+    """Return (format, width, height) from image header bytes; 0x0 if the format is known but dims aren't."""
+    try:
+        if data.startswith(b"\x89PNG\r\n\x1a\n") and len(data) >= 24:
+            w, h = struct.unpack(">II", data[16:24])
+            return "png", w, h
+
+        if data[:6] in (b"GIF87a", b"GIF89a") and len(data) >= 10:
+            w, h = struct.unpack("<HH", data[6:10])
+            return "gif", w, h
+
+        if data.startswith(b"BM") and len(data) >= 26:
+            w, h = struct.unpack("<ii", data[18:26])
+            return "bmp", abs(w), abs(h)
+
+        if data[:4] == b"RIFF" and data[8:12] == b"WEBP" and len(data) >= 30:
+            chunk = data[12:16]
+            if chunk == b"VP8 ":
+                w, h = struct.unpack("<HH", data[26:30])
+                return "webp", w & 0x3FFF, h & 0x3FFF
+            if chunk == b"VP8L":
+                b = data[21:25]
+                w = 1 + (((b[1] & 0x3F) << 8) | b[0])
+                h = 1 + (((b[3] & 0x0F) << 10) | (b[2] << 2) | ((b[1] & 0xC0) >> 6))
+                return "webp", w, h
+            if chunk == b"VP8X":
+                w = 1 + int.from_bytes(data[24:27], "little")
+                h = 1 + int.from_bytes(data[27:30], "little")
+                return "webp", w, h
+            return "webp", 0, 0
+
+        if data[4:8] == b"ftyp" and data[8:12] in (b"avif", b"avis"):
+            i = data.find(b"ispe")
+            if i != -1 and len(data) >= i + 16:
+                w, h = struct.unpack(">II", data[i + 8:i + 16])
+                return "avif", w, h
+            return "avif", 0, 0
+
+        if data.startswith(b"\xff\xd8"):
+            i = 2
+            while i + 9 < len(data):
+                if data[i] != 0xFF:
+                    i += 1
+                    continue
+                marker = data[i + 1]
+                if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7 or marker == 0xFF:
+                    i += 1
+                    continue
+                seg_len = struct.unpack(">H", data[i + 2:i + 4])[0]
+                # SOFn markers, excluding DHT (C4), JPG (C8) and DAC (CC)
+                if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+                    h, w = struct.unpack(">HH", data[i + 5:i + 9])
+                    return "jpeg", w, h
+                i += 2 + seg_len
+            return "jpeg", 0, 0
+    except (struct.error, IndexError):
+        return None
+    return None
+
+
+def _fetch_head_bytes(url: str, timeout: float) -> tuple[int, bytes]:
+    """Return (status code, first _PROBE_BYTES of the body); body is empty on non-2xx."""
+    headers = dict(_PROBE_HEADERS, Range=f"bytes=0-{_PROBE_BYTES - 1}")
+    with requests.get(url, headers=headers, stream=True, timeout=timeout) as resp:
+        if resp.status_code not in (200, 206):
+            return resp.status_code, b""
+        buf = bytearray()
+        # servers that ignore Range send the full body; stop reading once we have enough
+        for chunk in resp.iter_content(chunk_size=4096):
+            buf.extend(chunk)
+            if len(buf) >= _PROBE_BYTES:
+                break
+        return resp.status_code, bytes(buf[:_PROBE_BYTES])
+
+
+def probe_image(url: str, timeout: float = 5.0) -> tuple[str, int, int, str] | None:
+    """Return (format, width, height, digest) for an image URL, or None if it's broken."""
+    with _probe_lock:
+        if url in _probe_cache:
+            _probe_cache.move_to_end(url)
+            return _probe_cache[url]
+
+    try:
+        status, data = _fetch_head_bytes(url, timeout)
+    except requests.RequestException:
+        # transient network errors aren't cached
+        logger.debug("Image probe failed for %s", url, exc_info=True)
+        return None
+
+    if status not in (200, 206) and status not in _PERMANENT_FAILURE_STATUSES:
+        # 403 (hotlink protection), 429, 5xx etc. may succeed later; don't cache
+        return None
+
+    result = None
+    if data:
+        sniffed = _sniff_image_size(data)
+        if sniffed:
+            result = (*sniffed, hashlib.sha1(data).hexdigest())
+
+    # cache successful sniffs plus definitive failures (gone, or not an image)
+    with _probe_lock:
+        _probe_cache[url] = result
+        while len(_probe_cache) > _PROBE_CACHE_SIZE:
+            _probe_cache.popitem(last=False)
+    return result
+
+
+def validate_image_urls(
+    urls: list[str],
+    max_images: int = 3,
+    min_width: int = 300,
+    min_height: int = 200,
+    timeout: float = 5.0,
+    max_workers: int = 8,
+) -> list[str]:
+    """
+    Probe candidate images concurrently with ranged requests and keep the best:
+    - drops broken/non-image responses and images below min_width x min_height
+    - drops duplicates (identical leading bytes)
+    - ranks by pixel area, largest first (unknown dims rank last)
+    """
+    if not urls:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as pool:
+        probes = list(pool.map(lambda u: probe_image(u, timeout), urls))
+
+    seen_digests: set[str] = set()
+    ranked: list[tuple[int, int, str]] = []
+    for pos, (url, probe) in enumerate(zip(urls, probes)):
+        if probe is None:
+            continue
+        _, w, h, digest = probe
+        if digest in seen_digests:
+            continue
+        if w and h and (w < min_width or h < min_height):
+            continue
+        seen_digests.add(digest)
+        ranked.append((w * h, -pos, url))
+
+    ranked.sort(reverse=True)
+    return [url for _, _, url in ranked[:max_images]]
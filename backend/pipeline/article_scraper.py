@@ -1,22 +1,90 @@
 from newspaper import Article as NewspaperArticle
 import logging
+import time
+
+import requests
+from w3lib.encoding import html_to_unicode
 
 from models import Article
-from pipeline.article_image import extract_article_image_urls
+from pipeline.article_image import extract_article_image_urls, validate_image_urls
 
 logger = logging.getLogger(__name__)
 
+MAX_DOWNLOAD_BYTES = 3 * 1024 * 1024
+CONNECT_TIMEOUT = 5.0
+_HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+_DOWNLOAD_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36",
+}
+
+
+class ScrapeTimeout(Exception):
+    """Raised when an article's deadline passes mid-scrape."""
+
+
+def _check_deadline(deadline: float | None, url: str):
+    if deadline is not None and time.monotonic() >= deadline:
+        raise ScrapeTimeout(url)
+
+
 class ArticleScraper:
-    def scrape(self, url: str) -> Article | None:
-        try:
-            article = NewspaperArticle(url)
-            article.download()
+    def __init__(self, max_download_bytes: int = MAX_DOWNLOAD_BYTES):
+        self.max_download_bytes = max_download_bytes
+
+    def download(self, url: str, deadline: float | None = None) -> str:
+        """
+        Fetch a page's HTML, stopping at max_download_bytes (the truncated
+        prefix is still parsed) or when the deadline passes. Returns "" for
+        non-HTML responses (PDFs, images, ...).
+        """
+        read_timeout = 15.0
+        if deadline is not None:
+            read_timeout = max(0.1, min(read_timeout, deadline - time.monotonic()))
+
+        with requests.get(
+            url,
+            headers=_DOWNLOAD_HEADERS,
+            stream=True,
+            timeout=(CONNECT_TIMEOUT, read_timeout),
+        ) as resp:
+            resp.raise_for_status()
+            content_type = resp.headers.get("content-type")
+            mime = (content_type or "").split(";", 1)[0].strip().lower()
+            if mime and mime not in _HTML_CONTENT_TYPES:
+                logger.info("Skipping %s: content type %s is not HTML", url, mime)
+                return ""
 
-            # Grab HTML right after download (before parse/nlp)
-            html = getattr(article, "html", "") or ""
+            buf = bytearray()
+            for chunk in resp.iter_content(chunk_size=16 * 1024):
+                buf.extend(chunk)
+                if len(buf) >= self.max_download_bytes:
+                    logger.info("Download of %s hit the %d byte cap", url, self.max_download_bytes)
+                    break
+                _check_deadline(deadline, url)
+            # same decoding as newspaper: header charset, BOM, then <meta charset>
+            _, html = html_to_unicode(content_type, bytes(buf[:self.max_download_bytes]))
+            return html or ""
 
+    def scrape(self, url: str, validate_images: bool = False, deadline: float | None = None) -> Article | None:
+        """
+        Download, parse and summarize an article. `deadline` is a time.monotonic()
+        timestamp; ScrapeTimeout is raised if it passes between stages.
+        """
+        try:
+            html = self.download(url, deadline)
+            if not html:
+                return None
+            _check_deadline(deadline, url)
+
+            article = NewspaperArticle(url)
+            article.download(input_html=html)
             article.parse()
+            _check_deadline(deadline, url)
             article.nlp()
+        except ScrapeTimeout:
+            raise
+        except requests.Timeout as exc:
+            raise ScrapeTimeout(url) from exc
         except Exception:
             logger.exception("Failed scraping/NLP for %s", url)
             return None
@@ -27,6 +95,12 @@ class ArticleScraper:
         publish_date = str(article.publish_date) if article.publish_date else None
 
         image_urls = extract_article_image_urls(html, url, max_images=10)
+        if validate_images:
+            probe_timeout = 5.0
+            if deadline is not None:
+                probe_timeout = min(probe_timeout, deadline - time.monotonic())
+            if probe_timeout > 0:
+                image_urls = validate_image_urls(image_urls, timeout=probe_timeout)
 
         return Article(
             url=url,
@@ -37,4 +111,4 @@ class ArticleScraper:
             source=article.source_url or "",
             summary=article.summary or "",
             image_urls=image_urls,
-        )
\ No newline at end of file
+        )
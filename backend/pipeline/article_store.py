@@ -0,0 +1,38 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+from models import Article
+
+
+class ArticleStore:
+    """In-memory LRU of scraped articles, keyed by a stable id derived from the URL.
+
+    Slim SSE streams only send card fields; the full body is kept here so the
+    client can fetch it on demand.
+    """
+
+    def __init__(self, max_items: int = 500):
+        self.max_items = max_items
+        self._items: OrderedDict[str, Article] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_id(url: str) -> str:
+        return hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+
+    def put(self, article: Article) -> str:
+        article_id = self.make_id(article.url)
+        with self._lock:
+            self._items[article_id] = article
+            self._items.move_to_end(article_id)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+        return article_id
+
+    def get(self, article_id: str) -> Article | None:
+        with self._lock:
+            article = self._items.get(article_id)
+            if article is not None:
+                self._items.move_to_end(article_id)
+            return article
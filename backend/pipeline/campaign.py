@@ -0,0 +1,162 @@
+import logging
+import queue
+import threading
+import uuid
+from typing import Iterator
+
+from ai_pipeline import chunk_article, embed_chunks, retrieve_relevant_chunks, generate_campaign_kit
+from models import ScrapeRequest
+from pipeline.news_searcher import EVENT_TYPE_LABELS
+from pipeline.orchestrator import ScraperPipeline
+
+logger = logging.getLogger(__name__)
+
+# generation starts once this many articles are embedded (or scraping runs dry)
+MIN_EVIDENCE_ARTICLES = 3
+TOP_K_CHUNKS = 8
+
+_END = object()
+
+
+class CampaignPipeline:
+    """
+    Scrape -> chunk/embed -> retrieve -> generate, run as a producer/consumer
+    pipeline so each article is embedded while later ones are still being
+    scraped. Embedding and generation models (and the generation config) are
+    injectable so tests can run against LocalEmbeddingModel and a fake
+    generator.
+    """
+
+    def __init__(
+        self,
+        scraper: ScraperPipeline,
+        embed_model=None,
+        generation_model=None,
+        generation_config=None,
+        min_evidence_articles: int = MIN_EVIDENCE_ARTICLES,
+        top_k: int = TOP_K_CHUNKS,
+    ):
+        self.scraper = scraper
+        self.embed_model = embed_model
+        self.generation_model = generation_model
+        self.generation_config = generation_config
+        self.min_evidence_articles = min_evidence_articles
+        self.top_k = top_k
+
+    def stream(self, request: ScrapeRequest) -> Iterator[dict]:
+        """Yield stage/progress events as dicts, ending with `campaign_kit` + `done` or `error`."""
+        campaign_id = "campaign_" + uuid.uuid4().hex[:12]
+        needed = min(self.min_evidence_articles, request.max_articles or 5)
+
+        events: queue.Queue = queue.Queue()
+        articles: queue.Queue = queue.Queue()
+        stop = threading.Event()
+        chunks: list[dict] = []
+        chunks_lock = threading.Lock()
+
+        def produce():
+            try:
+                for event in self.scraper.stream_articles(request):
+                    if stop.is_set():
+                        break
+                    if event["type"] == "article":
+                        articles.put(event["article"])
+                    elif event["type"] == "done":
+                        events.put({"type": "stage", "stage": "scrape", "message": f"Scraping finished ({event['sent']} articles)"})
+                    else:
+                        events.put(event)
+            except Exception:
+                logger.exception("Scrape stage failed for campaign %s", campaign_id)
+                events.put({"type": "error", "message": "Failed to scrape articles"})
+            finally:
+                articles.put(_END)
+
+        def consume():
+            embedded = 0
+            try:
+                while not stop.is_set():
+                    article = articles.get()
+                    if article is _END:
+                        break
+                    article_chunks = chunk_article(
+                        article_text=article.text,
+                        source_url=article.url,
+                        title=article.title,
+                        publish_date=article.publish_date or "",
+                        campaign_id=campaign_id,
+                        article_index=embedded,
+                    )
+                    embed_chunks(article_chunks, model=self.embed_model)
+                    with chunks_lock:
+                        chunks.extend(article_chunks)
+                    embedded += 1
+                    events.put({
+                        "type": "stage",
+                        "stage": "embed",
+                        "message": f"Embedded {len(article_chunks)} chunks from {article.title or article.url}",
+                        "articles": embedded,
+                    })
+                    if embedded >= needed:
+                        break
+            except Exception:
+                logger.exception("Embed stage failed for campaign %s", campaign_id)
+                events.put({"type": "error", "message": "Failed to embed articles"})
+            finally:
+                events.put(_END)
+
+        producer = threading.Thread(target=produce, daemon=True)
+        consumer = threading.Thread(target=consume, daemon=True)
+        producer.start()
+        consumer.start()
+
+        try:
+            while True:
+                event = events.get()
+                if event is _END:
+                    break
+                yield event
+                if event["type"] == "error":
+                    # clients treat error as the end of the stream
+                    return
+
+            # enough evidence (or nothing left to scrape): stop starting new scrapes
+            stop.set()
+            with chunks_lock:
+                evidence = list(chunks)
+
+            if not evidence:
+                yield {"type": "error", "message": "No article content to build a campaign from"}
+                return
+
+            yield {"type": "stage", "stage": "retrieve", "message": f"Retrieving from {len(evidence)} chunks..."}
+            label = EVENT_TYPE_LABELS.get(request.event_type.upper(), request.event_type)
+            query = " ".join(p for p in (label, request.event_name or request.country, "humanitarian impact") if p)
+            try:
+                retrieved = retrieve_relevant_chunks(query, evidence, top_k=self.top_k, model=self.embed_model)
+            except Exception:
+                logger.exception("Retrieval failed for campaign %s", campaign_id)
+                yield {"type": "error", "message": "Failed to retrieve evidence"}
+                return
+
+            source_urls = list(dict.fromkeys(chunk["source_url"] for chunk, _ in retrieved))
+            yield {"type": "stage", "stage": "generate", "message": f"Generating campaign kit from {len(source_urls)} sources..."}
+            try:
+                kit = generate_campaign_kit(
+                    retrieved,
+                    source_urls,
+                    model=self.generation_model,
+                    generation_config=self.generation_config,
+                )
+            except Exception:
+                logger.exception("Generation failed for campaign %s", campaign_id)
+                yield {"type": "error", "message": "Failed to generate campaign kit"}
+                return
+
+            if "error" in kit:
+                yield {"type": "error", "message": kit["error"]}
+                return
+
+            yield {"type": "campaign_kit", "campaign_id": campaign_id, "kit": kit, "sources": source_urls}
+            yield {"type": "done", "campaign_id": campaign_id, "chunks": len(evidence), "sources": len(source_urls)}
+        finally:
+            stop.set()
@@ -0,0 +1,175 @@
+import math
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from models import DisasterEvent
+
+ALERT_LEVELS = {"green": 1, "orange": 2, "red": 3}
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def alert_rank(level: str) -> int:
+    return ALERT_LEVELS.get((level or "").strip().lower(), 0)
+
+
+def _timestamp(date: str) -> float | None:
+    try:
+        dt = parsedate_to_datetime(date)
+    except Exception:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def _haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _in_bbox(lat: float, lon: float, bbox: tuple[float, float, float, float]) -> bool:
+    min_lat, min_lon, max_lat, max_lon = bbox
+    if not (min_lat <= lat <= max_lat):
+        return False
+    if min_lon <= max_lon:
+        return min_lon <= lon <= max_lon
+    # bbox crosses the antimeridian
+    return lon >= min_lon or lon <= max_lon
+
+
+def _radius_bbox(lat: float, lon: float, radius_km: float) -> tuple[float, float, float, float]:
+    dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = max(-90.0, lat - dlat), min(90.0, lat + dlat)
+    cos_lat = math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+    if cos_lat <= 1e-9 or dlat / cos_lat >= 180:
+        return min_lat, -180.0, max_lat, 180.0
+    dlon = dlat / cos_lat
+    min_lon, max_lon = lon - dlon, lon + dlon
+    if min_lon < -180:
+        min_lon += 360
+    if max_lon > 180:
+        max_lon -= 360
+    return min_lat, min_lon, max_lat, max_lon
+
+
+class EventIndex:
+    """In-memory index over a GDACS feed snapshot.
+
+    Events are bucketed by type, alert level and a lat/lon grid, and kept in
+    newest-first order so `since` filters can stop early. `snapshot_id`
+    changes on every rebuild so pagination cursors can detect a refresh.
+    """
+
+    def __init__(self, events: list[DisasterEvent], cell_deg: float = 5.0):
+        self.snapshot_id = uuid.uuid4().hex[:12]
+        self.events = list(events)
+        self.cell_deg = cell_deg
+        self._by_type: dict[str, set[int]] = defaultdict(set)
+        self._by_alert: dict[int, set[int]] = defaultdict(set)
+        self._grid: dict[tuple[int, int], set[int]] = defaultdict(set)
+        self._timestamps: list[float | None] = []
+
+        for i, event in enumerate(self.events):
+            self._by_type[event.event_type.upper()].add(i)
+            self._by_alert[alert_rank(event.alert_level)].add(i)
+            self._grid[self._cell(event.lat, event.lon)].add(i)
+            self._timestamps.append(_timestamp(event.date))
+
+        # undated events sort last
+        self._order = sorted(
+            range(len(self.events)),
+            key=lambda i: self._timestamps[i] if self._timestamps[i] is not None else -math.inf,
+            reverse=True,
+        )
+        # position of each event in _order, for sorting filtered candidates
+        self._rank = [0] * len(self.events)
+        for rank, i in enumerate(self._order):
+            self._rank[i] = rank
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def _cell(self, lat: float, lon: float) -> tuple[int, int]:
+        return math.floor(lat / self.cell_deg), math.floor(lon / self.cell_deg)
+
+    def _cells_in_bbox(self, bbox: tuple[float, float, float, float]) -> set[int]:
+        min_lat, min_lon, max_lat, max_lon = bbox
+        lat_lo, lon_lo = self._cell(min_lat, min_lon)
+        lat_hi, lon_hi = self._cell(max_lat, max_lon)
+        if min_lon <= max_lon:
+            lon_ranges = [range(lon_lo, lon_hi + 1)]
+        else:
+            _, west_edge = self._cell(0, -180.0)
+            _, east_edge = self._cell(0, 180.0)
+            lon_ranges = [range(lon_lo, east_edge + 1), range(west_edge, lon_hi + 1)]
+
+        found: set[int] = set()
+        for lat_cell in range(lat_lo, lat_hi + 1):
+            for lon_range in lon_ranges:
+                for lon_cell in lon_range:
+                    found |= self._grid.get((lat_cell, lon_cell), set())
+        return found
+
+    def query(
+        self,
+        event_type: str | None = None,
+        min_alert: str | None = None,
+        since: datetime | None = None,
+        bbox: tuple[float, float, float, float] | None = None,
+        near: tuple[float, float, float] | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> tuple[list[DisasterEvent], int]:
+        """Return (page, total matches), newest first.
+
+        `bbox` is (min_lat, min_lon, max_lat, max_lon); `near` is (lat, lon, radius_km).
+        """
+        candidates: set[int] | None = None
+
+        def narrow(ids: set[int]):
+            nonlocal candidates
+            candidates = ids if candidates is None else candidates & ids
+
+        if event_type:
+            narrow(self._by_type.get(event_type.upper(), set()))
+        if min_alert:
+            threshold = alert_rank(min_alert)
+            narrow(set().union(*(ids for rank, ids in self._by_alert.items() if rank >= threshold)))
+        if bbox:
+            narrow(self._cells_in_bbox(bbox))
+        if near:
+            narrow(self._cells_in_bbox(_radius_bbox(*near)))
+
+        since_ts = None
+        if since is not None:
+            if since.tzinfo is None:
+                since = since.replace(tzinfo=timezone.utc)
+            since_ts = since.timestamp()
+
+        # only walk the whole feed when no bucket narrowed it down
+        if candidates is None:
+            ordered = self._order
+        else:
+            ordered = sorted(candidates, key=self._rank.__getitem__)
+
+        matches: list[DisasterEvent] = []
+        for i in ordered:
+            if since_ts is not None:
+                ts = self._timestamps[i]
+                if ts is None or ts < since_ts:
+                    break
+            event = self.events[i]
+            if bbox and not _in_bbox(event.lat, event.lon, bbox):
+                continue
+            if near and _haversine_km(near[0], near[1], event.lat, event.lon) > near[2]:
+                continue
+            matches.append(event)
+
+        end = None if limit is None else offset + limit
+        return matches[offset:end], len(matches)
@@ -1,11 +1,29 @@
+import threading
+import time
+
 import feedparser
 
 from models import DisasterEvent
+from pipeline.event_index import EventIndex
 
 GDACS_RSS_URL = "https://www.gdacs.org/xml/rss.xml"
 
 
 class GDACSClient:
+    def __init__(self, cache_ttl: float = 300.0):
+        self.cache_ttl = cache_ttl
+        self._index: EventIndex | None = None
+        self._index_built_at = 0.0
+        self._lock = threading.Lock()
+
+    def get_index(self) -> EventIndex:
+        """Return an index over the feed, refetching at most once per cache_ttl."""
+        with self._lock:
+            if self._index is None or time.monotonic() - self._index_built_at > self.cache_ttl:
+                self._index = EventIndex(self.fetch_events())
+                self._index_built_at = time.monotonic()
+            return self._index
+
     def fetch_events(self) -> list[DisasterEvent]:
         feed = feedparser.parse(GDACS_RSS_URL)
         events = []
@@ -38,9 +38,9 @@ class NewsSearcher:
             q += " after:" + after + " before:" + before
         return q
 
-    def search(self, query: str, limit: int | None = None) -> list[NewsResult]:
+    def search(self, query: str, limit: int | None = None, timeout: float = 15) -> list[NewsResult]:
         url = GOOGLE_NEWS_RSS.format(query=query)
-        response = requests.get(url, timeout=15)
+        response = requests.get(url, timeout=timeout)
         response.raise_for_status()
         feed = feedparser.parse(response.content)
 
@@ -1,11 +1,195 @@
-from models import Article, DisasterEvent
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from datetime import timedelta
+from email.utils import parsedate_to_datetime
+from typing import Iterator
+
+from models import Article, ScrapeRequest
 from pipeline.gdacs_client import GDACSClient
-from pipeline.news_searcher import NewsSearcher
-from pipeline.article_scraper import ArticleScraper
+from pipeline.news_searcher import NewsSearcher, EVENT_TYPE_LABELS
+from pipeline.article_scraper import ArticleScraper, ScrapeTimeout, MAX_DOWNLOAD_BYTES
+from pipeline.article_store import ArticleStore
+
+logger = logging.getLogger(__name__)
 
 
 class ScraperPipeline:
-    def __init__(self):
+    def __init__(self, max_download_bytes: int | None = None):
+        if max_download_bytes is None:
+            max_download_bytes = int(os.environ.get("SCRAPER_MAX_DOWNLOAD_BYTES", MAX_DOWNLOAD_BYTES))
         self.gdacs_client = GDACSClient()
         self.news_searcher = NewsSearcher()
-        self.article_scraper = ArticleScraper()
+        self.article_scraper = ArticleScraper(max_download_bytes=max_download_bytes)
+        self.article_store = ArticleStore()
+
+    def _resolve_and_scrape(self, url: str, validate_images: bool, deadline: float) -> Article | None:
+        # don't start work that is already past its deadline
+        if time.monotonic() >= deadline:
+            raise ScrapeTimeout(url)
+        real_url = self.news_searcher.resolve_url(url)
+        return self.article_scraper.scrape(real_url, validate_images=validate_images, deadline=deadline)
+
+    def stream_articles(self, request: ScrapeRequest) -> Iterator[dict]:
+        """
+        Search news for an event and scrape results one by one, yielding
+        status/progress/error events as dicts. Article events carry the
+        `Article` object itself; the stream ends with a `done` event unless
+        an error stops it first.
+
+        Each candidate gets `article_timeout_s`; once `latency_budget_s` is
+        spent no new candidates start and `done` reports what was gathered.
+        """
+        started = time.monotonic()
+        if not request:
+            yield {"type": "error", "message": "Query is required"}
+            return
+
+        budget_deadline = None
+        if request.latency_budget_s:
+            budget_deadline = started + request.latency_budget_s
+
+        event_type = request.event_type
+        country = request.country
+        event_name = request.event_name
+        date = request.date
+        type_str = EVENT_TYPE_LABELS.get(event_type.upper(), event_type)
+        max_articles = request.max_articles or 5
+        query = [type_str]
+        if event_name:
+            query.append(event_name)
+        elif country:
+            query.append(country)
+        else:
+            yield {"type": "error", "message": "Failed to retrieve event"}
+            return
+
+        relevance_keywords = query.copy() # keywords for relevance filtering
+        if date:
+            try:
+                dt = parsedate_to_datetime(date)
+                after = dt.strftime("%Y-%m-%d")
+                before = (dt + timedelta(days=5)).strftime("%Y-%m-%d")
+                query.append("after:" + after)
+                query.append("before:" + before)
+            except Exception:
+                logger.warning("Could not parse event date for query window: %s", date)
+                yield {"type": "error", "message": "Failed parse event date"}
+                return
+
+        query = '+'.join(query) # join query to a single string with + delim
+
+        yield {"type": "status", "message": 'Searching for "' + query + '"'}
+
+        # oversample so we still end up with max_articles even if some fail/are irrelevant
+        search_limit = max_articles * 4  # tweak 3–6 depending on speed/quality tradeoff
+
+        try:
+            search_timeout = 15.0
+            if budget_deadline is not None:
+                search_timeout = max(0.1, min(search_timeout, budget_deadline - time.monotonic()))
+            results = self.news_searcher.search(query, search_limit, timeout=search_timeout)
+        except Exception:
+            logger.exception("Search failed for query=%s", query)
+            yield {"type": "error", "message": "Failed to search news"}
+            return
+
+        total = len(results)
+        if total == 0:
+            yield {"type": "error", "message": "Did not find relevant articles"}
+            return
+
+        yield {
+            "type": "status",
+            "message": f"Found {total} results. Scraping up to {max_articles} articles..."
+        }
+
+        sent = 0
+        skipped = 0
+        timed_out = 0
+        budget_exhausted = False
+
+        # One pool per stream, sized so abandoned (timed-out) scrapes never
+        # delay the next candidate; threads are only created when none is idle.
+        executor = ThreadPoolExecutor(max_workers=total, thread_name_prefix="scrape")
+        try:
+            for i, result in enumerate(results):
+                if sent >= max_articles:
+                    break
+
+                now = time.monotonic()
+                if budget_deadline is not None and now >= budget_deadline:
+                    budget_exhausted = True
+                    yield {"type": "status", "message": "Latency budget spent, stopping early"}
+                    break
+
+                n = str(i + 1)
+                yield {
+                    "type": "progress",
+                    "message": "[" + n + "/" + str(total) + "] Resolving " + str(result.source) + "...",
+                    "current": i + 1,
+                    "total": total,
+                }
+
+                deadline = now + request.article_timeout_s
+                if budget_deadline is not None:
+                    deadline = min(deadline, budget_deadline)
+
+                future = executor.submit(
+                    self._resolve_and_scrape, result.url, request.validate_images, deadline
+                )
+                try:
+                    article = future.result(timeout=max(0.0, deadline - time.monotonic()))
+                except (FutureTimeout, ScrapeTimeout):
+                    # drop it if still queued; a running worker gives up at its next deadline check
+                    future.cancel()
+                    timed_out += 1
+                    yield {
+                        "type": "progress",
+                        "message": "[" + n + "/" + str(total) + "] Skipped (timed out)",
+                        "current": i + 1,
+                        "total": total,
+                    }
+                    continue
+                except Exception:
+                    logger.exception("Scrape failed for %s", result.url)
+                    article = None
+
+                if not article:
+                    skipped += 1
+                    yield {
+                        "type": "progress",
+                        "message": "[" + n + "/" + str(total) + "] Skipped (could not parse)",
+                        "current": i + 1,
+                        "total": total,
+                    }
+                    continue
+
+                # Relevance filter
+                if relevance_keywords:
+                    haystack = (article.title + " " + article.text).lower()
+                    if not any((kw or "").lower() in haystack for kw in relevance_keywords):
+                        skipped += 1
+                        yield {
+                            "type": "progress",
+                            "message": "[" + n + "/" + str(total) + "] Skipped (not relevant)",
+                            "current": i + 1,
+                            "total": total,
+                        }
+                        continue
+
+                sent += 1
+                yield {"type": "article", "article": article}
+
+            yield {
+                "type": "done",
+                "sent": sent,
+                "requested": max_articles,
+                "skipped": skipped,
+                "timed_out": timed_out,
+                "budget_exhausted": budget_exhausted,
+                "elapsed_s": round(time.monotonic() - started, 2),
+            }
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,117 @@
+import struct
+from collections import OrderedDict
+
+import pytest
+
+import pipeline.article_image as article_image
+from pipeline.article_image import _sniff_image_size, probe_image, validate_image_urls
+
+
+def png(w, h, seed=0):
+    return b"\x89PNG\r\n\x1a\n" + b"\x00\x00\x00\rIHDR" + struct.pack(">II", w, h) + bytes([8, 2, 0, 0, 0, seed])
+
+
+def gif(w, h):
+    return b"GIF89a" + struct.pack("<HH", w, h) + b"\x00\x00\x00"
+
+
+def jpeg(w, h):
+    app0 = b"\xff\xe0" + struct.pack(">H", 16) + b"JFIF\x00" + b"\x01\x01\x00\x00\x01\x00\x01\x00\x00"
+    sof0 = b"\xff\xc0" + struct.pack(">HBHHB", 17, 8, h, w, 3) + b"\x00" * 9
+    return b"\xff\xd8" + app0 + sof0
+
+
+def webp_vp8x(w, h):
+    payload = b"\x00\x00\x00\x00" + (w - 1).to_bytes(3, "little") + (h - 1).to_bytes(3, "little")
+    return b"RIFF" + struct.pack("<I", 4 + 8 + len(payload)) + b"WEBP" + b"VP8X" + struct.pack("<I", len(payload)) + payload
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(article_image, "_probe_cache", OrderedDict())
+
+
+@pytest.fixture
+def fake_fetch(monkeypatch):
+    responses: dict[str, tuple[int, bytes]] = {}
+    calls: list[str] = []
+
+    def fetch(url, timeout):
+        calls.append(url)
+        return responses[url]
+
+    monkeypatch.setattr(article_image, "_fetch_head_bytes", fetch)
+    return responses, calls
+
+
+@pytest.mark.parametrize("data, expected", [
+    (png(640, 427), ("png", 640, 427)),
+    (gif(320, 200), ("gif", 320, 200)),
+    (jpeg(1200, 800), ("jpeg", 1200, 800)),
+    (webp_vp8x(1920, 1080), ("webp", 1920, 1080)),
+    (b"<!doctype html><html>", None),
+])
+def test_sniff_image_size(data, expected):
+    assert _sniff_image_size(data) == expected
+
+
+def test_validate_ranks_by_area_and_drops_small_broken_and_duplicates(fake_fetch):
+    responses, _ = fake_fetch
+    responses.update({
+        "https://img.test/icon.png": (200, png(64, 64)),
+        "https://img.test/medium.jpg": (206, jpeg(800, 600)),
+        "https://img.test/large.png": (206, png(1600, 900, seed=1)),
+        "https://img.test/large-copy.png": (206, png(1600, 900, seed=1)),
+        "https://img.test/broken.jpg": (200, b"<html>not found</html>"),
+        "https://img.test/gone.jpg": (404, b""),
+        "https://img.test/wide.gif": (200, gif(1000, 400)),
+    })
+    kept = validate_image_urls(list(responses), max_images=3)
+    assert kept == [
+        "https://img.test/large.png",
+        "https://img.test/medium.jpg",
+        "https://img.test/wide.gif",
+    ]
+
+
+def test_validate_respects_min_size_and_max_images(fake_fetch):
+    responses, _ = fake_fetch
+    responses.update({
+        "https://img.test/a.png": (200, png(400, 150)),
+        "https://img.test/b.png": (200, png(500, 300, seed=2)),
+        "https://img.test/c.png": (200, png(900, 700, seed=3)),
+    })
+    assert validate_image_urls(list(responses), max_images=1) == ["https://img.test/c.png"]
+    assert validate_image_urls(list(responses), min_height=100) == [
+        "https://img.test/c.png", "https://img.test/b.png", "https://img.test/a.png",
+    ]
+
+
+def test_probe_caches_success_and_definitive_failures(fake_fetch):
+    responses, calls = fake_fetch
+    responses.update({
+        "https://img.test/ok.png": (200, png(800, 600)),
+        "https://img.test/missing.png": (404, b""),
+        "https://img.test/gone.png": (410, b""),
+        "https://img.test/page.html": (200, b"<html></html>"),
+    })
+    for url in responses:
+        probe_image(url)
+        probe_image(url)
+    # each fetched once; the second probe came from the cache
+    assert sorted(calls) == sorted(responses)
+    assert probe_image("https://img.test/ok.png")[:3] == ("png", 800, 600)
+    assert probe_image("https://img.test/missing.png") is None
+
+
+@pytest.mark.parametrize("status", [403, 429, 500, 503])
+def test_probe_does_not_cache_transient_failures(fake_fetch, status):
+    responses, calls = fake_fetch
+    url = "https://img.test/flaky.png"
+    responses[url] = (status, b"")
+    assert probe_image(url) is None
+    assert url not in article_image._probe_cache
+
+    responses[url] = (200, png(800, 600))
+    assert probe_image(url)[:3] == ("png", 800, 600)
+    assert calls == [url, url]
@@ -0,0 +1,202 @@
+import json
+import threading
+import time
+
+from ai_pipeline import LocalEmbeddingModel
+from models import Article, NewsResult, ScrapeRequest
+from pipeline.campaign import CampaignPipeline
+from pipeline.orchestrator import ScraperPipeline
+
+RELEVANT_TEXT = "Severe flooding in Mozambique has displaced families.\n\nAid agencies are delivering clean water."
+
+
+class FakeNewsSearcher:
+    def search(self, query, limit=None, timeout=15):
+        return [NewsResult(title=f"t{i}", url=f"https://news.test/{i}", source="Test", pub_date="") for i in range(6)]
+
+    def resolve_url(self, url):
+        return url
+
+
+class FakeArticleScraper:
+    """Blocks scrapes on signals from the test so stage ordering is deterministic."""
+
+    def __init__(self, first_embed_seen: threading.Event, stream_finished: threading.Event):
+        self.first_embed_seen = first_embed_seen
+        self.stream_finished = stream_finished
+        self.calls: list[str] = []
+
+    def scrape(self, url, validate_images=False, deadline=None):
+        self.calls.append(url)
+        index = int(url.rsplit("/", 1)[-1])
+        if index == 1:
+            # only finishes once the first article has been embedded
+            assert self.first_embed_seen.wait(5)
+        if index >= 3:
+            # anything past the evidence threshold must not block the campaign
+            self.stream_finished.wait(5)
+        text = "Unrelated sports coverage." if index == 1 else RELEVANT_TEXT
+        return Article(
+            url=url, title=f"Article {index}", text=text, authors=[],
+            publish_date=None, source="https://news.test", summary="",
+        )
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeGenerator:
+    def __init__(self):
+        self.prompts: list[str] = []
+        self.configs: list = []
+
+    def generate_content(self, prompt, generation_config=None):
+        self.prompts.append(prompt)
+        self.configs.append(generation_config)
+        source = prompt.split("SOURCES:\n", 1)[1].split("\n", 1)[0]
+        return FakeResponse(json.dumps({
+            "title": "Mozambique flood relief",
+            "location": "Mozambique",
+            "event_type": "flood",
+            "summary": "Families need shelter and clean water.",
+            "key_claims": [{"claim": "Families were displaced.", "source_url": source}],
+            "confidence_score": 0.8,
+        }))
+
+
+class FailingSecondEmbedModel(LocalEmbeddingModel):
+    """Embeds the first article, then fails."""
+
+    def __init__(self, chunks_per_article):
+        super().__init__()
+        self.remaining = chunks_per_article
+
+    def get_embeddings(self, texts):
+        if self.remaining <= 0:
+            raise RuntimeError("embedding backend unavailable")
+        self.remaining -= len(texts)
+        return super().get_embeddings(texts)
+
+
+GENERATION_CONFIG = {"response_mime_type": "application/json"}
+
+
+def _label(event):
+    return event.get("stage", event["type"])
+
+
+def _request():
+    return ScrapeRequest(
+        event_type="FL", title="", event_name="", country="Mozambique", severity="",
+        alert_level="Red", lat=-18.7, lon=35.5, date="", gdacs_url="", max_articles=5,
+    )
+
+
+def _scraper(article_scraper):
+    scraper = ScraperPipeline()
+    scraper.news_searcher = FakeNewsSearcher()
+    scraper.article_scraper = article_scraper
+    return scraper
+
+
+def test_campaign_stream_overlaps_stages_and_stops_at_evidence_threshold():
+    first_embed_seen = threading.Event()
+    stream_finished = threading.Event()
+    scraper = _scraper(FakeArticleScraper(first_embed_seen, stream_finished))
+    generator = FakeGenerator()
+    campaign = CampaignPipeline(
+        scraper,
+        embed_model=LocalEmbeddingModel(),
+        generation_model=generator,
+        generation_config=GENERATION_CONFIG,
+        min_evidence_articles=2,
+    )
+    request = _request()
+
+    events = []
+    try:
+        for event in campaign.stream(request):
+            events.append(event)
+            if _label(event) == "embed":
+                first_embed_seen.set()
+    finally:
+        stream_finished.set()
+
+    labels = [_label(e) for e in events]
+    first_embed = labels.index("embed")
+    # scrape progress keeps arriving after embedding has started
+    assert "progress" in labels[first_embed + 1:]
+    assert any("Skipped (not relevant)" in e.get("message", "") for e in events[first_embed + 1:])
+    assert labels.count("embed") == 2
+    assert labels[-4:] == ["retrieve", "generate", "campaign_kit", "done"]
+
+    kit_event = events[-2]
+    assert kit_event["kit"]["location"] == "Mozambique"
+    assert set(kit_event["sources"]) <= {"https://news.test/0", "https://news.test/2"}
+    assert len(generator.prompts) == 1
+    assert generator.configs == [GENERATION_CONFIG]
+
+    # evidence was reached after article 2, so at most one more scrape started
+    time.sleep(0.2)
+    assert scraper.article_scraper.calls[:3] == [f"https://news.test/{i}" for i in range(3)]
+    assert len(scraper.article_scraper.calls) <= 4
+
+
+def test_chunk_ids_are_unique_across_articles(monkeypatch):
+    import pipeline.campaign as campaign_module
+
+    embedded_chunks = []
+    real_embed = campaign_module.embed_chunks
+
+    def recording_embed(chunks, model=None):
+        embedded_chunks.extend(chunks)
+        return real_embed(chunks, model=model)
+
+    monkeypatch.setattr(campaign_module, "embed_chunks", recording_embed)
+    first_embed_seen = threading.Event()
+    first_embed_seen.set()
+    stream_finished = threading.Event()
+    campaign = CampaignPipeline(
+        _scraper(FakeArticleScraper(first_embed_seen, stream_finished)),
+        embed_model=LocalEmbeddingModel(),
+        generation_model=FakeGenerator(),
+        generation_config=GENERATION_CONFIG,
+        min_evidence_articles=2,
+    )
+    try:
+        events = list(campaign.stream(_request()))
+    finally:
+        stream_finished.set()
+
+    assert events[-1]["type"] == "done"
+    ids = [c["id"] for c in embedded_chunks]
+    assert len(ids) == len(set(ids)) == 4
+    assert ids[0].endswith("_a0_chunk_0") and ids[-1].endswith("_a1_chunk_1")
+    assert len({c["campaign_id"] for c in embedded_chunks}) == 1
+
+
+def test_embed_failure_ends_stream_with_error():
+    first_embed_seen = threading.Event()
+    first_embed_seen.set()
+    stream_finished = threading.Event()
+    generator = FakeGenerator()
+    campaign = CampaignPipeline(
+        _scraper(FakeArticleScraper(first_embed_seen, stream_finished)),
+        embed_model=FailingSecondEmbedModel(chunks_per_article=2),
+        generation_model=generator,
+        generation_config=GENERATION_CONFIG,
+        min_evidence_articles=3,
+    )
+    try:
+        events = list(campaign.stream(_request()))
+    finally:
+        stream_finished.set()
+
+    labels = [_label(e) for e in events]
+    assert "embed" in labels
+    assert labels[-1] == "error"
+    assert labels.count("error") == 1
+    assert "campaign_kit" not in labels and "retrieve" not in labels
+    assert generator.prompts == []
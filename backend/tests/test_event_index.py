@@ -0,0 +1,131 @@
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from models import DisasterEvent
+from pipeline.event_index import EventIndex
+
+
+def _event(name, lat, lon, event_type="EQ", alert_level="Green", date="Mon, 05 Jan 2026 10:00:00 GMT"):
+    return DisasterEvent(
+        event_type=event_type, title=name, event_name=name, country="", severity="",
+        alert_level=alert_level, lat=lat, lon=lon, date=date, gdacs_url="",
+    )
+
+
+def _names(events):
+    return [e.event_name for e in events]
+
+
+def test_bbox_crossing_antimeridian():
+    index = EventIndex([
+        _event("fiji", -17.0, 179.5),
+        _event("samoa", -14.0, -172.0),
+        _event("sydney", -33.9, 151.2),
+        _event("hawaii", 19.9, -155.6),
+    ])
+    page, total = index.query(bbox=(-30.0, 170.0, 0.0, -170.0))
+    assert sorted(_names(page)) == ["fiji", "samoa"]
+    assert total == 2
+
+
+def test_radius_search_across_antimeridian():
+    index = EventIndex([
+        _event("east", -16.5, 179.8),
+        _event("west", -16.5, -179.8),
+        _event("far", -16.5, 175.0),
+    ])
+    page, _ = index.query(near=(-16.5, 180.0, 100.0))
+    assert sorted(_names(page)) == ["east", "west"]
+
+
+def test_radius_search_near_pole():
+    # at 89.5N every longitude is within ~111 km of the pole side of the point
+    index = EventIndex([
+        _event("across_pole", 89.6, -90.0),
+        _event("same_side", 89.0, 0.0),
+        _event("too_far", 87.0, 0.0),
+    ])
+    page, _ = index.query(near=(89.5, 90.0, 150.0))
+    assert sorted(_names(page)) == ["across_pole", "same_side"]
+
+
+def test_min_alert_threshold():
+    index = EventIndex([
+        _event("green", 0, 0, alert_level="Green"),
+        _event("orange", 0, 0, alert_level="Orange"),
+        _event("red", 0, 0, alert_level="Red"),
+        _event("unknown", 0, 0, alert_level="Unknown"),
+    ])
+    assert sorted(_names(index.query(min_alert="orange")[0])) == ["orange", "red"]
+    assert _names(index.query(min_alert="Red")[0]) == ["red"]
+    assert len(index.query(min_alert="green")[0]) == 3
+
+
+def test_since_excludes_undated_events():
+    index = EventIndex([
+        _event("old", 0, 0, date="Thu, 01 Jan 2026 00:00:00 GMT"),
+        _event("new", 0, 0, date="Sat, 10 Jan 2026 00:00:00 GMT"),
+        _event("undated", 0, 0, date=""),
+    ])
+    assert _names(index.query()[0]) == ["new", "old", "undated"]
+    assert _names(index.query(since=datetime(2026, 1, 5))[0]) == ["new"]
+    # same answer when buckets narrow the candidates first
+    assert _names(index.query(since=datetime(2026, 1, 5), event_type="eq")[0]) == ["new"]
+
+
+def test_filters_combine_and_keep_newest_first():
+    index = EventIndex([
+        _event("eq_old", 10, 10, date="Thu, 01 Jan 2026 00:00:00 GMT"),
+        _event("fl", 10, 10, event_type="FL", date="Fri, 02 Jan 2026 00:00:00 GMT"),
+        _event("eq_new", 11, 11, date="Sat, 03 Jan 2026 00:00:00 GMT"),
+        _event("eq_elsewhere", -40, 100, date="Sun, 04 Jan 2026 00:00:00 GMT"),
+    ])
+    page, total = index.query(event_type="EQ", bbox=(0, 0, 20, 20))
+    assert _names(page) == ["eq_new", "eq_old"]
+    assert total == 2
+
+
+def test_limit_and_offset_paging():
+    events = [_event(f"e{d}", 0, 0, date=f"Mon, {d:02d} Jan 2026 00:00:00 GMT") for d in range(1, 6)]
+    index = EventIndex(events)
+    first, total = index.query(limit=2)
+    second, _ = index.query(limit=2, offset=2)
+    last, _ = index.query(limit=2, offset=4)
+    assert total == 5
+    assert _names(first + second + last) == ["e5", "e4", "e3", "e2", "e1"]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    events = [_event(f"e{d}", 0, 0, date=f"Mon, {d:02d} Jan 2026 00:00:00 GMT") for d in range(1, 6)]
+    monkeypatch.setattr(main.gdacs_client, "fetch_events", lambda: events)
+    monkeypatch.setattr(main.gdacs_client, "_index", None)
+    return TestClient(main.app)
+
+
+def test_events_api_cursor_paging(client):
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        body = client.get("/api/events", params=params).json()
+        seen += [e["event_name"] for e in body["events"]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == ["e5", "e4", "e3", "e2", "e1"]
+
+
+def test_events_api_rejects_stale_and_negative_cursors(client, monkeypatch):
+    cursor = client.get("/api/events", params={"limit": 2}).json()["next_cursor"]
+    snapshot_id = cursor.split(":")[0]
+    assert client.get("/api/events", params={"cursor": f"{snapshot_id}:-5"}).status_code == 400
+
+    # force a feed refresh; the old cursor must not silently page the new snapshot
+    monkeypatch.setattr(main.gdacs_client, "_index", None)
+    assert client.get("/api/events", params={"limit": 2, "cursor": cursor}).status_code == 400
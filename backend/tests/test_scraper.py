@@ -0,0 +1,134 @@
+import http.server
+import threading
+import time
+
+import pytest
+from newspaper import Article as NewspaperArticle
+
+from models import Article, NewsResult, ScrapeRequest
+from pipeline.article_scraper import ArticleScraper
+from pipeline.orchestrator import ScraperPipeline
+
+PARAGRAPH = "<p>Severe flooding in Mozambique has displaced thousands of families, officials said on Tuesday.</p>"
+
+
+class FakeNewsSearcher:
+    def __init__(self, count):
+        self.count = count
+
+    def search(self, query, limit=None, timeout=15):
+        return [NewsResult(title=f"t{i}", url=f"https://news.test/{i}", source="Test", pub_date="") for i in range(self.count)]
+
+    def resolve_url(self, url):
+        return url
+
+
+class HangingScraper:
+    """Scrapes for urls in `hung` block until released; the rest return at once."""
+
+    def __init__(self, hung):
+        self.hung = hung
+        self.release = threading.Event()
+
+    def scrape(self, url, validate_images=False, deadline=None):
+        if url in self.hung:
+            self.release.wait(10)
+        return Article(
+            url=url, title="Flood", text="Flooding in Mozambique.", authors=[],
+            publish_date=None, source="https://news.test", summary="",
+        )
+
+
+def _request(**kwargs):
+    return ScrapeRequest(
+        event_type="FL", title="", event_name="", country="Mozambique", severity="",
+        alert_level="Red", lat=-18.7, lon=35.5, date="", gdacs_url="", **kwargs,
+    )
+
+
+def test_hung_scrapes_time_out_without_blocking_the_stream():
+    # more hung pages than any fixed-size pool would have workers
+    hung = {f"https://news.test/{i}" for i in range(12)}
+    pipeline = ScraperPipeline()
+    pipeline.news_searcher = FakeNewsSearcher(14)
+    pipeline.article_scraper = HangingScraper(hung)
+
+    started = time.monotonic()
+    try:
+        events = list(pipeline.stream_articles(_request(max_articles=2, article_timeout_s=0.1)))
+    finally:
+        pipeline.article_scraper.release.set()
+    elapsed = time.monotonic() - started
+
+    done = events[-1]
+    assert done["type"] == "done"
+    assert done["timed_out"] == 12
+    assert done["sent"] == 2
+    assert [e["article"].url for e in events if e["type"] == "article"] == [
+        "https://news.test/12", "https://news.test/13",
+    ]
+    # each hung page costs about its own timeout, nothing more
+    assert elapsed < 12 * 0.1 + 1.0
+
+
+def test_latency_budget_stops_starting_new_candidates():
+    pipeline = ScraperPipeline()
+    pipeline.news_searcher = FakeNewsSearcher(6)
+    pipeline.article_scraper = HangingScraper({f"https://news.test/{i}" for i in range(6)})
+    try:
+        events = list(pipeline.stream_articles(_request(latency_budget_s=0.35, article_timeout_s=0.2)))
+    finally:
+        pipeline.article_scraper.release.set()
+
+    done = events[-1]
+    assert done["budget_exhausted"] is True
+    assert done["timed_out"] == 2
+    assert done["sent"] == 0
+
+
+def test_max_download_bytes_from_env(monkeypatch):
+    monkeypatch.setenv("SCRAPER_MAX_DOWNLOAD_BYTES", "12345")
+    assert ScraperPipeline().article_scraper.max_download_bytes == 12345
+    assert ScraperPipeline(max_download_bytes=999).article_scraper.max_download_bytes == 999
+
+
+@pytest.fixture
+def big_page_server():
+    head = ("<html><head><title>Mozambique floods</title></head><body><article>"
+            + PARAGRAPH * 40 + "</article>").encode()
+    padding = b"<div>" + b"x" * 16 * 1024 + b"</div>"
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.end_headers()
+            try:
+                self.wfile.write(head)
+                for _ in range(1000):  # ~16 MB if the client kept reading
+                    self.wfile.write(padding)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/article"
+    server.shutdown()
+
+
+def test_download_stops_at_byte_cap_and_still_parses(big_page_server, monkeypatch):
+    url = big_page_server
+    cap = 64 * 1024
+    scraper = ArticleScraper(max_download_bytes=cap)
+
+    html = scraper.download(url)
+    assert cap - 16 * 1024 < len(html.encode()) <= cap
+
+    # summarization needs nltk, which isn't what this test is about
+    monkeypatch.setattr(NewspaperArticle, "nlp", lambda self: None)
+    article = scraper.scrape(url)
+    assert article is not None
+    assert article.title == "Mozambique floods"
+    assert "displaced thousands of families" in article.text